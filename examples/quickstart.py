@@ -19,7 +19,7 @@ import random
 import tempfile
 from pathlib import Path
 
-from aumai_policyminer.core import LogParser, PolicyExtractor, PolicyFormatter
+from aumai_policyminer.core import DEFAULT_FORMATTER, LogParser, PolicyExtractor
 from aumai_policyminer.models import BehaviorLog, PolicySet
 
 
@@ -209,7 +209,7 @@ def demo_rendering() -> None:
     extractor = PolicyExtractor(min_support=0.05, min_confidence=0.55)
     policy_set = extractor.extract(logs, name="Rendering Demo")
 
-    formatter = PolicyFormatter()
+    formatter = DEFAULT_FORMATTER
 
     # Plain text (show first 3 policies)
     print("  -- Plain Text (max 3 policies) --")
@@ -250,7 +250,7 @@ def demo_save_reload(tmp_dir: Path) -> None:
 
     # Save
     out_path = tmp_dir / "policies_v1.json"
-    formatter = PolicyFormatter()
+    formatter = DEFAULT_FORMATTER
     formatter.to_json_file(policy_set, out_path)
     print(f"  Saved {len(policy_set.policies)} policies to {out_path}")
 
@@ -7,13 +7,12 @@ Commands:
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
 import click
 
-from .core import LogParser, PolicyExtractor, PolicyFormatter
+from .core import DEFAULT_FORMATTER, Algorithm, LogParser, PolicyExtractor
 from .models import PolicySet
 
 
@@ -59,6 +58,20 @@ def main() -> None:
     type=float,
     help="Minimum lift threshold.",
 )
+@click.option(
+    "--algorithm",
+    default="single",
+    show_default=True,
+    type=click.Choice(["single", "fpgrowth", "apriori"], case_sensitive=False),
+    help="Mining algorithm; fpgrowth/apriori mine multi-key antecedents.",
+)
+@click.option(
+    "--max-antecedent-size",
+    default=3,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Maximum context pairs per antecedent (fpgrowth/apriori only).",
+)
 @click.option("--name", default="Mined Policy Set", show_default=True, type=str)
 def extract_command(
     logs_path: Path,
@@ -66,6 +79,8 @@ def extract_command(
     min_support: float,
     min_confidence: float,
     min_lift: float,
+    algorithm: Algorithm,
+    max_antecedent_size: int,
     name: str,
 ) -> None:
     """Extract governance policies from a JSONL behavior log file.
@@ -82,17 +97,18 @@ def extract_command(
         min_support=min_support,
         min_confidence=min_confidence,
         min_lift=min_lift,
+        algorithm=algorithm,
+        max_antecedent_size=max_antecedent_size,
     )
     policy_set = extractor.extract(logs, name=name)
     click.echo(f"Mined {len(policy_set.policies)} policies.")
 
-    formatter = PolicyFormatter()
     dest = output_path or logs_path.parent / "policies.json"
-    formatter.to_json_file(policy_set, dest)
+    DEFAULT_FORMATTER.to_json_file(policy_set, dest)
     click.echo(f"Saved policy set to {dest}")
 
     # Print a brief summary
-    click.echo(formatter.to_text(policy_set, max_policies=10))
+    click.echo(DEFAULT_FORMATTER.to_text(policy_set, max_policies=10))
 
 
 @main.command("format")
@@ -128,13 +144,12 @@ def format_command(
         aumai-policyminer format --policies policies.json --output-format markdown
     """
     try:
-        data = json.loads(policies_path.read_text(encoding="utf-8"))
-        policy_set = PolicySet.model_validate(data)
+        policy_set = PolicySet.model_validate_json(policies_path.read_bytes())
     except Exception as exc:
         click.echo(f"ERROR loading policy set: {exc}", err=True)
         sys.exit(1)
 
-    formatter = PolicyFormatter()
+    formatter = DEFAULT_FORMATTER
 
     if output_format == "text":
         click.echo(formatter.to_text(policy_set, max_policies=max_policies))
@@ -0,0 +1,270 @@
+"""Frequent itemset mining for multi-key policy antecedents.
+
+Provides:
+- fpgrowth: FP-tree based frequent itemset mining (no candidate generation).
+- apriori: level-wise mining with downward-closure candidate pruning.
+
+Both functions operate on transactions of small non-negative integer item ids
+and return identical results, so callers can factorise their own items and
+pick whichever algorithm suits the data.  Both take optional ``anchors``:
+item ids without which an itemset is not grown to the full ``max_len``, so
+callers that only use full-size itemsets holding an anchor (such as a rule's
+consequent) skip the rest.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Collection, Sequence
+from itertools import combinations
+
+Itemset = tuple[int, ...]
+
+
+# ---------------------------------------------------------------------------
+# FP-Growth
+# ---------------------------------------------------------------------------
+
+
+class _FPNode:
+    """One node of an FP-tree: an item on a shared transaction prefix."""
+
+    __slots__ = ("item", "count", "parent", "children")
+
+    def __init__(self, item: int, parent: _FPNode | None) -> None:
+        self.item = item
+        self.count = 0
+        self.parent = parent
+        self.children: dict[int, _FPNode] = {}
+
+
+def _build_tree(
+    weighted: Sequence[tuple[Sequence[int], int]], min_count: int
+) -> dict[int, list[_FPNode]]:
+    """Build an FP-tree and return its header table.
+
+    Args:
+        weighted: ``(items, weight)`` transactions.
+        min_count: Minimum item count to keep an item in the tree.
+
+    Returns:
+        Mapping of each frequent item to every tree node holding it, ordered
+        from the least to the most frequent item.
+    """
+    counts: dict[int, int] = {}
+    for items, weight in weighted:
+        for item in items:
+            counts[item] = counts.get(item, 0) + weight
+    frequent = {item: c for item, c in counts.items() if c >= min_count}
+    # Most frequent first so common prefixes share nodes; ties broken by id
+    # so the tree shape is deterministic.
+    rank = {
+        item: r
+        for r, item in enumerate(sorted(frequent, key=lambda i: (-frequent[i], i)))
+    }
+
+    root = _FPNode(-1, None)
+    header: dict[int, list[_FPNode]] = {
+        item: [] for item in sorted(rank, key=rank.__getitem__, reverse=True)
+    }
+    for items, weight in weighted:
+        node = root
+        for item in sorted((i for i in items if i in rank), key=rank.__getitem__):
+            child = node.children.get(item)
+            if child is None:
+                child = node.children[item] = _FPNode(item, node)
+                header[item].append(child)
+            child.count += weight
+            node = child
+    return header
+
+
+def _mine_tree(
+    header: dict[int, list[_FPNode]],
+    suffix: Itemset,
+    min_count: int,
+    max_len: int,
+    out: dict[Itemset, int],
+    anchors: frozenset[int] | None,
+) -> None:
+    """Recursively emit every frequent itemset ending in ``suffix``."""
+    for item, nodes in header.items():
+        itemset = tuple(sorted((*suffix, item)))
+        unanchored = anchors is not None and anchors.isdisjoint(itemset)
+        if unanchored and len(itemset) >= max_len:
+            continue
+        out[itemset] = sum(node.count for node in nodes)
+        if len(itemset) >= max_len:
+            continue
+        # Only an anchor may complete an unanchored itemset, so the other
+        # items are left out of its conditional tree.
+        keep = anchors if unanchored and len(itemset) == max_len - 1 else None
+        pattern_base: list[tuple[list[int], int]] = []
+        for node in nodes:
+            path: list[int] = []
+            parent = node.parent
+            while parent is not None and parent.parent is not None:
+                if keep is None or parent.item in keep:
+                    path.append(parent.item)
+                parent = parent.parent
+            if path:
+                pattern_base.append((path, node.count))
+        if pattern_base:
+            _mine_tree(
+                _build_tree(pattern_base, min_count),
+                itemset,
+                min_count,
+                max_len,
+                out,
+                anchors,
+            )
+
+
+def fpgrowth(
+    transactions: Sequence[Sequence[int]],
+    min_count: int,
+    max_len: int,
+    anchors: Collection[int] | None = None,
+) -> dict[Itemset, int]:
+    """Mine frequent itemsets with FP-Growth.
+
+    Transactions are compressed into a prefix tree in two passes (one to
+    count items, one to insert them in descending-frequency order) and
+    itemsets are grown from conditional trees, so no candidates are
+    generated.
+
+    Args:
+        transactions: Item ids per transaction; ids within one transaction
+            must be distinct.
+        min_count: Minimum number of transactions containing an itemset.
+        max_len: Maximum itemset size to emit.
+        anchors: If given, itemsets containing none of these ids are only
+            emitted up to ``max_len - 1`` items.
+
+    Returns:
+        Mapping of each frequent itemset (sorted tuple of ids) to its count.
+
+    Example:
+        >>> fpgrowth([[0, 1], [0, 1], [0, 2]], min_count=2, max_len=2)
+        {(0,): 3, (0, 1): 2, (1,): 2}
+    """
+    out: dict[Itemset, int] = {}
+    if max_len < 1:
+        return out
+    _mine_tree(
+        _build_tree([(t, 1) for t in transactions], min_count),
+        (),
+        min_count,
+        max_len,
+        out,
+        None if anchors is None else frozenset(anchors),
+    )
+    return dict(sorted(out.items()))
+
+
+# ---------------------------------------------------------------------------
+# Apriori
+# ---------------------------------------------------------------------------
+
+
+def _count_anchored(
+    baskets: list[list[int]],
+    candidates: set[Itemset],
+    size: int,
+    anchors: frozenset[int],
+) -> dict[Itemset, int]:
+    """Count anchored ``candidates`` without enumerating unanchored combinations.
+
+    Each candidate is keyed by its lowest anchor and its other items, so a
+    basket only enumerates the ``size - 1`` combinations around each anchor
+    it holds (excluding lower anchors, so nothing is counted twice).
+    """
+    by_anchor: dict[int, dict[Itemset, Itemset]] = {}
+    for candidate in candidates:
+        anchor = min(item for item in candidate if item in anchors)
+        rest = tuple(item for item in candidate if item != anchor)
+        by_anchor.setdefault(anchor, {})[rest] = candidate
+    counts: dict[Itemset, int] = {}
+    for basket in baskets:
+        for i, item in enumerate(basket):
+            lookup = by_anchor.get(item)
+            if lookup is None:
+                continue
+            others = [o for o in basket[:i] if o not in anchors] + basket[i + 1 :]
+            for combo in combinations(others, size - 1):
+                itemset = lookup.get(combo)
+                if itemset is not None:
+                    counts[itemset] = counts.get(itemset, 0) + 1
+    return counts
+
+
+def apriori(
+    transactions: Sequence[Sequence[int]],
+    min_count: int,
+    max_len: int,
+    anchors: Collection[int] | None = None,
+) -> dict[Itemset, int]:
+    """Mine frequent itemsets with level-wise Apriori.
+
+    Size-``k`` candidates are joined from frequent ``(k-1)``-itemsets that
+    share a ``(k-2)``-prefix, and any candidate with an infrequent subset is
+    pruned before counting.
+
+    Args:
+        transactions: Item ids per transaction; ids within one transaction
+            must be distinct.
+        min_count: Minimum number of transactions containing an itemset.
+        max_len: Maximum itemset size to emit.
+        anchors: If given, itemsets containing none of these ids are only
+            emitted up to ``max_len - 1`` items, and the last level only
+            enumerates combinations that hold an anchor.
+
+    Returns:
+        Mapping of each frequent itemset (sorted tuple of ids) to its count.
+    """
+    out: dict[Itemset, int] = {}
+    if max_len < 1:
+        return out
+    anchor_set = None if anchors is None else frozenset(anchors)
+
+    counts: dict[Itemset, int] = {}
+    for transaction in transactions:
+        for item in transaction:
+            key = (item,)
+            counts[key] = counts.get(key, 0) + 1
+    level = {s: c for s, c in counts.items() if c >= min_count}
+    if max_len == 1 and anchor_set is not None:
+        level = {s: c for s, c in level.items() if s[0] in anchor_set}
+    out.update(level)
+    frequent_items = {s[0] for s in level}
+    baskets = [sorted(i for i in t if i in frequent_items) for t in transactions]
+
+    for size in range(2, max_len + 1):
+        prev = sorted(level)
+        candidates: set[Itemset] = set()
+        for i, left in enumerate(prev):
+            for right in prev[i + 1 :]:
+                if left[:-1] != right[:-1]:
+                    break
+                candidate = (*left, right[-1])
+                if all(sub in level for sub in combinations(candidate, size - 1)):
+                    candidates.add(candidate)
+        last_anchors = anchor_set if size == max_len else None
+        if last_anchors is not None:
+            candidates = {c for c in candidates if not last_anchors.isdisjoint(c)}
+        if not candidates:
+            break
+        if last_anchors is not None:
+            counts = _count_anchored(baskets, candidates, size, last_anchors)
+        else:
+            counts = {}
+            for basket in baskets:
+                if len(basket) < size:
+                    continue
+                for combo in combinations(basket, size):
+                    if combo in candidates:
+                        counts[combo] = counts.get(combo, 0) + 1
+        level = {s: c for s, c in counts.items() if c >= min_count}
+        if not level:
+            break
+        out.update(level)
+    return dict(sorted(out.items()))
@@ -1,11 +1,47 @@
-"""Pydantic v2 models for the policy miner."""
+"""Pydantic v2 models for the policy miner.
+
+``BehaviorLogLite`` and ``LogTable`` are plain slotted dataclasses used on the
+parsing and mining hot path, where Pydantic's per-instance overhead is not
+needed.
+"""
 
 from __future__ import annotations
 
+import heapq
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# Shared default timestamp for logs built inside batch_timestamp().
+_BATCH_TS: ContextVar[str | None] = ContextVar("_BATCH_TS", default=None)
+
+
+def _default_timestamp() -> str:
+    """Return the active batch timestamp, or the current UTC time."""
+    return _BATCH_TS.get() or datetime.now(timezone.utc).isoformat()
+
+
+@contextmanager
+def batch_timestamp() -> Iterator[str]:
+    """Give every BehaviorLog built in this block the same default timestamp.
+
+    Used by ``LogParser`` so that logs without an explicit ``timestamp`` cost
+    one clock read per file instead of one per line.
+
+    Yields:
+        The shared ISO-8601 timestamp.
+    """
+    stamp = datetime.now(timezone.utc).isoformat()
+    token = _BATCH_TS.set(stamp)
+    try:
+        yield stamp
+    finally:
+        _BATCH_TS.reset(token)
 
 
 class BehaviorLog(BaseModel):
@@ -20,9 +56,11 @@ class BehaviorLog(BaseModel):
         outcome: Optional outcome label (e.g. "success", "denied", "error").
     """
 
+    model_config = ConfigDict(frozen=True)
+
     log_id: str
     agent_id: str
-    timestamp: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    timestamp: str = Field(default_factory=_default_timestamp)
     action: str
     context: dict[str, Any] = Field(default_factory=dict)
     outcome: str = Field(default="success")
@@ -36,6 +74,53 @@ class BehaviorLog(BaseModel):
         return value.strip()
 
 
+@dataclass(slots=True, frozen=True)
+class BehaviorLogLite:
+    """Lightweight, unvalidated counterpart of :class:`BehaviorLog`.
+
+    Carries no timestamp and runs no validators; instances are built by
+    ``LogParser.parse_list_lite`` / ``parse_file_lite``, which apply the same
+    field checks as ``BehaviorLog`` before construction.  Instances built
+    directly must keep ``context`` keys as strings.
+
+    Attributes:
+        log_id: Unique identifier for the log entry.
+        agent_id: Identifier of the agent that performed the action.
+        action: The action the agent took, already stripped.
+        context: Key-value metadata describing the situation.
+        outcome: Outcome label.
+    """
+
+    log_id: str
+    agent_id: str
+    action: str
+    context: dict[str, Any] = field(default_factory=dict)
+    outcome: str = "success"
+
+
+@dataclass(slots=True)
+class LogTable:
+    """Columnar (struct-of-arrays) view of the fields the extractor reads.
+
+    Row ``i`` describes one log: ``actions[i]`` is its action and
+    ``context_keys[i]`` / ``context_vals[i]`` are its context keys and their
+    string values, in matching order.
+
+    Attributes:
+        actions: One action per log.
+        context_keys: Context keys per log.
+        context_vals: Stringified context values per log.
+    """
+
+    actions: list[str] = field(default_factory=list)
+    context_keys: list[list[str]] = field(default_factory=list)
+    context_vals: list[list[str]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Return the number of logs in the table."""
+        return len(self.actions)
+
+
 class MinedPolicy(BaseModel):
     """A governance policy extracted from behavioral patterns.
 
@@ -49,6 +134,8 @@ class MinedPolicy(BaseModel):
         description: Human-readable explanation of the policy.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     policy_id: str
     antecedent: dict[str, Any]
     consequent: str
@@ -58,6 +145,11 @@ class MinedPolicy(BaseModel):
     description: str = Field(default="")
 
 
+def _confidence(policy: MinedPolicy) -> float:
+    """Sort key for ranking policies."""
+    return policy.confidence
+
+
 class PolicySet(BaseModel):
     """A collection of mined policies with metadata.
 
@@ -76,10 +168,16 @@ class PolicySet(BaseModel):
     def top_policies(self, n: int = 10) -> list[MinedPolicy]:
         """Return the top-n policies sorted by confidence descending.
 
+        The top ``n`` are selected with a heap, which keeps ties in their
+        original order like a stable sort.
+
         Args:
             n: Maximum number of policies to return.
 
         Returns:
             List of MinedPolicy objects.
         """
-        return sorted(self.policies, key=lambda p: p.confidence, reverse=True)[:n]
+        if n < 0:
+            # Keep slice semantics (drop the last -n) for negative n.
+            return sorted(self.policies, key=_confidence, reverse=True)[:n]
+        return heapq.nlargest(n, self.policies, key=_confidence)
@@ -3,13 +3,28 @@
 from __future__ import annotations
 
 import json
+from functools import lru_cache
 from pathlib import Path
 
+import pytest
 from click.testing import CliRunner
 
 from aumai_policyminer.cli import main
 
+# CliRunner holds no per-test state; one instance serves the whole module.
+_RUNNER = CliRunner()
 
+
+def _invoke(*args: str) -> object:
+    """Run the CLI in-process without CliRunner's isolation or capture.
+
+    For tests that only check side effects such as written files.
+    """
+    with main.make_context("aumai-policyminer", list(args)) as ctx:
+        return main.invoke(ctx)
+
+
+@lru_cache(maxsize=None)
 def make_jsonl_content(count: int = 10) -> str:
     lines = []
     for i in range(count):
@@ -24,6 +39,18 @@ def make_jsonl_content(count: int = 10) -> str:
     return "\n".join(lines)
 
 
+@pytest.fixture(scope="session")
+def jsonl10(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Ten-log JSONL file written once and shared by the extract tests.
+
+    Tests must pass ``--output`` into their own ``tmp_path``; the default
+    writes policies.json into this shared directory.
+    """
+    path = tmp_path_factory.mktemp("logs") / "logs.jsonl"
+    path.write_text(make_jsonl_content(10))
+    return path
+
+
 def make_policy_set_json() -> dict:
     return {
         "name": "Test Policies",
@@ -45,69 +72,79 @@ def make_policy_set_json() -> dict:
 
 class TestCLIVersion:
     def test_cli_version(self) -> None:
-        runner = CliRunner()
-        result = runner.invoke(main, ["--version"])
+        result = _RUNNER.invoke(main, ["--version"])
         assert result.exit_code == 0
         assert "0.1.0" in result.output
 
     def test_cli_help(self) -> None:
-        runner = CliRunner()
-        result = runner.invoke(main, ["--help"])
+        result = _RUNNER.invoke(main, ["--help"])
         assert result.exit_code == 0
 
 
 class TestExtractCommand:
-    def test_extract_basic(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            Path("logs.jsonl").write_text(make_jsonl_content(10))
-            result = runner.invoke(main, ["extract", "--logs", "logs.jsonl"])
-            assert result.exit_code == 0
-            assert "Parsed 10 valid log entries" in result.output
+    def test_extract_basic(self, jsonl10: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "policies.json"
+        result = _RUNNER.invoke(
+            main, ["extract", "--logs", str(jsonl10), "--output", str(output_path)]
+        )
+        assert result.exit_code == 0
+        assert "Parsed 10 valid log entries" in result.output
+
+    def test_extract_unreachable_min_support(self, jsonl10: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "policies.json"
+        result = _RUNNER.invoke(main, [
+            "extract", "--logs", str(jsonl10), "--output", str(output_path),
+            "--min-support", "1e30",
+        ])
+        assert result.exit_code == 0
+        assert json.loads(output_path.read_text())["policies"] == []
 
     def test_extract_shows_policy_count(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             Path("logs.jsonl").write_text(make_jsonl_content(20))
-            result = runner.invoke(main, ["extract", "--logs", "logs.jsonl", "--min-support", "0.01", "--min-confidence", "0.5"])
+            result = _RUNNER.invoke(main, ["extract", "--logs", "logs.jsonl", "--min-support", "0.01", "--min-confidence", "0.5"])
             assert result.exit_code == 0
             assert "Mined" in result.output
 
-    def test_extract_creates_output_file(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            Path("logs.jsonl").write_text(make_jsonl_content(10))
-            result = runner.invoke(main, ["extract", "--logs", "logs.jsonl", "--output", "out.json"])
-            assert result.exit_code == 0
-            assert Path("out.json").exists()
-
-    def test_extract_output_is_valid_json(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            Path("logs.jsonl").write_text(make_jsonl_content(10))
-            runner.invoke(main, ["extract", "--logs", "logs.jsonl", "--output", "out.json", "--min-confidence", "0.5"])
-            data = json.loads(Path("out.json").read_text())
-            assert "policies" in data
-            assert "source_logs" in data
-
-    def test_extract_custom_name(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
-            Path("logs.jsonl").write_text(make_jsonl_content(10))
-            result = runner.invoke(main, ["extract", "--logs", "logs.jsonl", "--name", "My Custom Set"])
-            assert result.exit_code == 0
-            assert "My Custom Set" in result.output
+    def test_extract_creates_output_file(self, jsonl10: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "out.json"
+        _invoke("extract", "--logs", str(jsonl10), "--output", str(output_path))
+        assert output_path.exists()
+
+    def test_extract_output_is_valid_json(self, jsonl10: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "out.json"
+        _invoke("extract", "--logs", str(jsonl10), "--output", str(output_path), "--min-confidence", "0.5")
+        data = json.loads(output_path.read_text())
+        assert "policies" in data
+        assert "source_logs" in data
+
+    def test_extract_custom_name(self, jsonl10: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "policies.json"
+        result = _RUNNER.invoke(main, [
+            "extract", "--logs", str(jsonl10), "--output", str(output_path),
+            "--name", "My Custom Set",
+        ])
+        assert result.exit_code == 0
+        assert "My Custom Set" in result.output
+
+    def test_extract_fpgrowth(self, jsonl10: Path, tmp_path: Path) -> None:
+        output_path = tmp_path / "out.json"
+        result = _RUNNER.invoke(main, [
+            "extract", "--logs", str(jsonl10), "--output", str(output_path),
+            "--algorithm", "fpgrowth", "--max-antecedent-size", "2",
+        ])
+        assert result.exit_code == 0
+        data = json.loads(output_path.read_text())
+        assert data["policies"][0]["antecedent"] == {"role": "manager"}
 
     def test_extract_missing_logs(self) -> None:
-        runner = CliRunner()
-        result = runner.invoke(main, ["extract", "--logs", "nonexistent.jsonl"])
+        result = _RUNNER.invoke(main, ["extract", "--logs", "nonexistent.jsonl"])
         assert result.exit_code != 0
 
     def test_extract_high_thresholds_zero_policies(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             Path("logs.jsonl").write_text(make_jsonl_content(5))
-            result = runner.invoke(main, [
+            result = _RUNNER.invoke(main, [
                 "extract", "--logs", "logs.jsonl",
                 "--min-confidence", "0.99", "--min-lift", "1000.0"
             ])
@@ -117,49 +154,43 @@ class TestExtractCommand:
 
 class TestFormatCommand:
     def test_format_text(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             Path("policies.json").write_text(json.dumps(make_policy_set_json()))
-            result = runner.invoke(main, ["format", "--policies", "policies.json"])
+            result = _RUNNER.invoke(main, ["format", "--policies", "policies.json"])
             assert result.exit_code == 0
             assert "Test Policies" in result.output
 
     def test_format_markdown(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             Path("policies.json").write_text(json.dumps(make_policy_set_json()))
-            result = runner.invoke(main, ["format", "--policies", "policies.json", "--output-format", "markdown"])
+            result = _RUNNER.invoke(main, ["format", "--policies", "policies.json", "--output-format", "markdown"])
             assert result.exit_code == 0
             assert "# Test Policies" in result.output
 
     def test_format_json(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             Path("policies.json").write_text(json.dumps(make_policy_set_json()))
-            result = runner.invoke(main, ["format", "--policies", "policies.json", "--output-format", "json"])
+            result = _RUNNER.invoke(main, ["format", "--policies", "policies.json", "--output-format", "json"])
             assert result.exit_code == 0
             # Output should be parseable JSON
             output_data = json.loads(result.output)
             assert output_data["name"] == "Test Policies"
 
     def test_format_missing_file(self) -> None:
-        runner = CliRunner()
-        result = runner.invoke(main, ["format", "--policies", "nonexistent.json"])
+        result = _RUNNER.invoke(main, ["format", "--policies", "nonexistent.json"])
         assert result.exit_code != 0
 
     def test_format_invalid_json(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             Path("bad.json").write_text("NOT VALID JSON")
-            result = runner.invoke(main, ["format", "--policies", "bad.json"])
+            result = _RUNNER.invoke(main, ["format", "--policies", "bad.json"])
             assert result.exit_code != 0
 
     def test_format_max_policies(self) -> None:
-        runner = CliRunner()
-        with runner.isolated_filesystem():
+        with _RUNNER.isolated_filesystem():
             ps = make_policy_set_json()
             # Add extra policies
             ps["policies"] = ps["policies"] * 10
             Path("policies.json").write_text(json.dumps(ps))
-            result = runner.invoke(main, ["format", "--policies", "policies.json", "--max-policies", "2"])
+            result = _RUNNER.invoke(main, ["format", "--policies", "policies.json", "--max-policies", "2"])
             assert result.exit_code == 0
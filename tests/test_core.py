@@ -15,8 +15,14 @@ from pathlib import Path
 import pytest
 from pydantic import ValidationError
 
-from aumai_policyminer.core import LogParser, PolicyExtractor, PolicyFormatter
-from aumai_policyminer.models import BehaviorLog, MinedPolicy, PolicySet
+from aumai_policyminer.core import Algorithm, LogParser, PolicyExtractor, PolicyFormatter
+from aumai_policyminer.models import (
+    BehaviorLog,
+    BehaviorLogLite,
+    LogTable,
+    MinedPolicy,
+    PolicySet,
+)
 
 
 # ---------------------------------------------------------------------------
@@ -60,17 +66,20 @@ def make_policy(
 
 
 def make_logs_with_pattern(count: int = 10) -> list[BehaviorLog]:
-    """Create logs where admin users always read_file."""
-    logs: list[BehaviorLog] = []
-    for i in range(count):
-        logs.append(BehaviorLog(
+    """Create logs where admin users always read_file.
+
+    The fields are known-valid, so validation is skipped.
+    """
+    return [
+        BehaviorLog.model_construct(
             log_id=f"log{i:04d}",
             agent_id="agent_alpha",
             action="read_file",
             context={"role": "admin"},
             outcome="success",
-        ))
-    return logs
+        )
+        for i in range(count)
+    ]
 
 
 # ---------------------------------------------------------------------------
@@ -85,6 +94,11 @@ class TestBehaviorLogModel:
         assert log.agent_id == "agent_alpha"
         assert log.action == "read_file"
 
+    def test_is_frozen(self) -> None:
+        log = make_log()
+        with pytest.raises(ValidationError):
+            log.action = "write_file"  # type: ignore[misc]
+
     def test_blank_action_raises(self) -> None:
         with pytest.raises(ValidationError):
             BehaviorLog(log_id="l1", agent_id="a1", action="  ")
@@ -134,6 +148,11 @@ class TestMinedPolicyModel:
         assert policy.policy_id == "policy_0001"
         assert policy.consequent == "read_file"
 
+    def test_is_frozen(self) -> None:
+        policy = make_policy()
+        with pytest.raises(ValidationError):
+            policy.confidence = 0.1  # type: ignore[misc]
+
     def test_support_bounds(self) -> None:
         with pytest.raises(ValidationError):
             MinedPolicy(policy_id="p1", antecedent={}, consequent="read", support=1.1, confidence=0.5)
@@ -177,6 +196,15 @@ class TestPolicySetModel:
         assert len(top) == 2
         assert top[0].confidence >= top[1].confidence
 
+    def test_top_policies_keeps_tie_order(self) -> None:
+        ps = PolicySet(policies=[
+            make_policy(policy_id="p1", confidence=0.5),
+            make_policy(policy_id="p2", confidence=0.9),
+            make_policy(policy_id="p3", confidence=0.5),
+            make_policy(policy_id="p4", confidence=0.9),
+        ])
+        assert [p.policy_id for p in ps.top_policies(3)] == ["p2", "p4", "p1"]
+
     def test_top_policies_limits_n(self) -> None:
         ps = PolicySet(policies=[make_policy(policy_id=f"p{i}") for i in range(20)])
         top = ps.top_policies(5)
@@ -187,6 +215,31 @@ class TestPolicySetModel:
         top = ps.top_policies(10)
         assert len(top) == 1
 
+    def test_top_policies_of_extracted_set_matches_sort(self) -> None:
+        ps = PolicyExtractor(min_support=0.01, min_confidence=0.1).extract(
+            make_logs_with_pattern(20)
+        )
+        expected = sorted(ps.policies, key=lambda p: p.confidence, reverse=True)
+        assert ps.top_policies(3) == expected[:3]
+
+    def test_top_policies_after_model_copy_and_append(self) -> None:
+        logs = [
+            make_log(log_id=f"l{i}", action="read" if i % 3 else "write",
+                     context={"role": "admin", "env": "prod"})
+            for i in range(6)
+        ]
+        ps = PolicyExtractor(min_support=0.01, min_confidence=0.0, min_lift=0.0).extract(
+            logs
+        )
+        reversed_ps = ps.model_copy(update={"policies": ps.policies[::-1]})
+        assert [p.confidence for p in reversed_ps.top_policies()] == [
+            0.666667, 0.666667, 0.333333, 0.333333
+        ]
+
+        best = make_policy(policy_id="best", confidence=0.99)
+        ps.policies.append(best)
+        assert ps.top_policies(2)[0] == best
+
     def test_generated_at_is_set(self) -> None:
         ps = PolicySet()
         assert ps.generated_at != ""
@@ -245,6 +298,20 @@ class TestLogParser:
         logs = parser.parse_file(jsonl_path)
         assert len(logs) == 2
 
+    def test_parse_file_counts_records_missing_fields(self, tmp_path: Path) -> None:
+        parser = LogParser()
+        jsonl_path = tmp_path / "logs.jsonl"
+        lines = [
+            json.dumps({"log_id": "l1", "agent_id": "a1", "action": "read"}),
+            json.dumps({"log_id": "l2", "action": "write"}),
+            json.dumps(["l3", "a1", "read"]),
+            json.dumps({"log_id": "l4", "agent_id": "a1", "action": "  "}),
+        ]
+        jsonl_path.write_text("\n".join(lines), encoding="utf-8")
+        logs = parser.parse_file(jsonl_path)
+        assert [log.log_id for log in logs] == ["l1"]
+        assert parser.skipped_count == 3
+
     def test_parse_file_skips_blank_lines(self, tmp_path: Path) -> None:
         parser = LogParser()
         jsonl_path = tmp_path / "logs.jsonl"
@@ -262,6 +329,244 @@ class TestLogParser:
         logs = parser.parse_file(jsonl_path)
         assert logs == []
 
+    @pytest.mark.parametrize("newline", ["\r", "\r\n"])
+    def test_parse_file_universal_newlines(self, tmp_path: Path, newline: str) -> None:
+        parser = LogParser()
+        jsonl_path = tmp_path / "logs.jsonl"
+        lines = [
+            json.dumps({"log_id": f"l{i}", "agent_id": "a1", "action": "read"})
+            for i in range(3)
+        ]
+        jsonl_path.write_bytes(newline.join(lines).encode())
+        logs = parser.parse_file(jsonl_path)
+        assert [log.log_id for log in logs] == ["l0", "l1", "l2"]
+        assert parser.skipped_count == 0
+        assert len(parser.parse_file_fast(jsonl_path)) == 3
+
+    def test_parse_file_newlines_across_chunks(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import aumai_policyminer.core as core
+
+        jsonl_path = tmp_path / "logs.jsonl"
+        lines = [
+            json.dumps({"log_id": f"l{i}", "agent_id": "a1", "action": "read"})
+            for i in range(20)
+        ]
+        endings = ["\n", "\r", "\r\n"]
+        jsonl_path.write_bytes(
+            "".join(line + endings[i % 3] for i, line in enumerate(lines)).encode()
+        )
+        # Odd chunk sizes land chunk boundaries between "\r" and "\n".
+        for chunk in (5, 7, 64):
+            monkeypatch.setattr(core, "_READ_CHUNK", chunk)
+            parser = LogParser()
+            logs = parser.parse_file(jsonl_path)
+            assert [log.log_id for log in logs] == [f"l{i}" for i in range(20)]
+            assert parser.skipped_count == 0
+
+    def test_parse_file_parallel_matches_serial(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import aumai_policyminer.core as core
+
+        jsonl_path = tmp_path / "logs.jsonl"
+        lines = [
+            json.dumps({"log_id": f"l{i}", "agent_id": "a1", "action": f"act{i % 3}"})
+            for i in range(50)
+        ]
+        # Bad lines in the first and last ranges, so every worker's count adds up.
+        lines.insert(10, "NOT VALID JSON")
+        lines.insert(45, json.dumps({"log_id": "x", "agent_id": "a1"}))
+        jsonl_path.write_text("\n".join(lines), encoding="utf-8")
+
+        serial = LogParser()
+        expected = serial.parse_file(jsonl_path)
+
+        monkeypatch.setattr(core, "_PARALLEL_MIN_BYTES", 0)
+        parallel = LogParser()
+        logs = parallel.parse_file(jsonl_path, workers=3)
+        assert [log.log_id for log in logs] == [log.log_id for log in expected]
+        assert parallel.skipped_count == serial.skipped_count == 2
+
+    def test_parse_file_parallel_timestamps(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import aumai_policyminer.core as core
+
+        jsonl_path = tmp_path / "logs.jsonl"
+        records = [
+            {"log_id": f"l{i}", "agent_id": "a1", "action": "read"} for i in range(30)
+        ]
+        records[0]["timestamp"] = "2024-01-01T00:00:00+00:00"
+        jsonl_path.write_text("\n".join(map(json.dumps, records)), encoding="utf-8")
+
+        monkeypatch.setattr(core, "_PARALLEL_MIN_BYTES", 0)
+        logs = LogParser().parse_file(jsonl_path, workers=3)
+        assert logs[0].timestamp == "2024-01-01T00:00:00+00:00"
+        # Each worker shares one default timestamp across its own range only.
+        data = jsonl_path.read_bytes()
+        offset = 0
+        for start, end in core._split_ranges(jsonl_path, 3):
+            count = len(data[start:end].splitlines())
+            part = logs[offset : offset + count]
+            assert len({log.timestamp for log in part if log.log_id != "l0"}) == 1
+            offset += count
+        assert offset == len(logs)
+
+    def test_parse_file_is_serial_by_default(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        import aumai_policyminer.core as core
+
+        def no_pool(*args: object, **kwargs: object) -> None:
+            raise AssertionError("parse_file started a process pool")
+
+        jsonl_path = tmp_path / "logs.jsonl"
+        jsonl_path.write_text(
+            json.dumps({"log_id": "l1", "agent_id": "a1", "action": "read"}),
+            encoding="utf-8",
+        )
+        monkeypatch.setattr(core, "_PARALLEL_MIN_BYTES", 0)
+        monkeypatch.setattr(core, "ProcessPoolExecutor", no_pool)
+        assert len(LogParser().parse_file(jsonl_path)) == 1
+
+    def test_parse_file_fast_returns_pairs(self, tmp_path: Path) -> None:
+        parser = LogParser()
+        jsonl_path = tmp_path / "logs.jsonl"
+        jsonl_path.write_text(
+            json.dumps({"log_id": "l1", "agent_id": "a1", "action": " read ",
+                        "context": {"role": "admin"}}) + "\n"
+            + "NOT VALID JSON\n\n"
+            + json.dumps({"log_id": "l2", "agent_id": "a2", "action": "  "}) + "\n"
+            + json.dumps({"log_id": "l3", "agent_id": "a3", "action": "write"}),
+            encoding="utf-8",
+        )
+        pairs = parser.parse_file_fast(jsonl_path)
+        assert pairs == [("read", {"role": "admin"}), ("write", {})]
+        assert parser.skipped_count == 2
+
+    def test_parse_list_lite_applies_required_field_checks(self) -> None:
+        parser = LogParser()
+        records = [
+            {"log_id": "l1", "agent_id": "a1", "action": " read ", "context": {"role": "admin"}},
+            {"invalid": "data_without_required_fields"},
+            {"log_id": "l2", "agent_id": "a2", "action": "   "},
+            {"log_id": "l3", "agent_id": "a3", "action": "write", "context": "oops"},
+        ]
+        logs = parser.parse_list_lite(records)
+        assert logs == [BehaviorLogLite(log_id="l1", agent_id="a1", action="read",
+                                        context={"role": "admin"})]
+
+    @pytest.mark.parametrize(
+        "extra",
+        [
+            {},
+            {"timestamp": 5},
+            {"timestamp": None},
+            {"timestamp": "2024-01-01T00:00:00+00:00"},
+            {"outcome": None},
+            {"outcome": "denied"},
+            {"context": None},
+            {"context": {1: "x"}},
+            {"context": {"role": 1, "tags": ["a"]}},
+            {"agent_id": 7},
+        ],
+    )
+    def test_lite_checks_agree_with_behavior_log(self, extra: dict) -> None:
+        parser = LogParser()
+        records = [{"log_id": "l1", "agent_id": "a1", "action": "read", **extra}]
+        assert len(parser.parse_list_lite(records)) == len(parser.parse_list(records))
+
+    def test_parse_file_fast_skips_like_parse_file(self, tmp_path: Path) -> None:
+        jsonl_path = tmp_path / "logs.jsonl"
+        jsonl_path.write_text(
+            json.dumps({"log_id": "l1", "agent_id": "a1", "action": "read"}) + "\n"
+            + json.dumps({"log_id": "l2", "agent_id": "a1", "action": "read",
+                          "timestamp": 5}) + "\n"
+            + json.dumps({"log_id": "l3", "agent_id": "a1", "action": "read",
+                          "outcome": None}),
+            encoding="utf-8",
+        )
+        full, fast = LogParser(), LogParser()
+        assert len(fast.parse_file_fast(jsonl_path)) == len(full.parse_file(jsonl_path))
+        assert fast.skipped_count == full.skipped_count == 2
+
+    def test_parse_file_lite_feeds_extractor(self, tmp_path: Path) -> None:
+        parser = LogParser()
+        jsonl_path = tmp_path / "logs.jsonl"
+        jsonl_path.write_text(
+            "\n".join(
+                json.dumps({"log_id": f"l{i}", "agent_id": "a1", "action": "read",
+                            "context": {"role": "admin"}})
+                for i in range(10)
+            ),
+            encoding="utf-8",
+        )
+        lite = parser.parse_file_lite(jsonl_path)
+        assert len(lite) == 10
+        extractor = PolicyExtractor(min_support=0.05, min_confidence=0.5)
+        assert extractor.extract(lite).policies == extractor.extract(
+            parser.parse_file(jsonl_path)
+        ).policies
+
+    def test_parse_file_columnar_feeds_extractor(self, tmp_path: Path) -> None:
+        parser = LogParser()
+        jsonl_path = tmp_path / "logs.jsonl"
+        jsonl_path.write_text(
+            json.dumps({"log_id": "l1", "agent_id": "a1", "action": "read",
+                        "context": {"role": "admin", "n": 3}}) + "\n"
+            + "NOT VALID JSON\n"
+            + json.dumps({"log_id": "l2", "agent_id": "a2", "action": "write"}),
+            encoding="utf-8",
+        )
+        table = parser.parse_file_columnar(jsonl_path)
+        assert len(table) == 2
+        assert table.actions == ["read", "write"]
+        assert table.context_keys == [["role", "n"], []]
+        assert table.context_vals == [["admin", "3"], []]
+        assert parser.skipped_count == 1
+
+        extractor = PolicyExtractor(min_support=0.01, min_confidence=0.1, min_lift=0.0)
+        assert extractor.extract_columnar(table).policies == extractor.extract(
+            parser.parse_file(jsonl_path)
+        ).policies
+
+    def test_parse_list_interns_repeated_strings(self) -> None:
+        parser = LogParser()
+        # join() builds distinct string objects for each record.
+        records = [
+            {
+                "log_id": f"l{i}",
+                "agent_id": "a1",
+                "action": "".join(["read", "_x"]),
+                "context": {"".join(["ro", "le"]): "".join(["ad", "min"])},
+            }
+            for i in range(2)
+        ]
+        first, second = parser.parse_list(records)
+        assert first.action is second.action
+        assert first.context["role"] is second.context["role"]
+        assert next(iter(first.context)) is next(iter(second.context))
+
+    def test_parse_list_shares_batch_timestamp(self) -> None:
+        parser = LogParser()
+        records = [
+            {"log_id": "l1", "agent_id": "a1", "action": "read"},
+            {
+                "log_id": "l2",
+                "agent_id": "a1",
+                "action": "read",
+                "timestamp": "2025-01-01T00:00:00+00:00",
+            },
+            {"log_id": "l3", "agent_id": "a1", "action": "read"},
+        ]
+        logs = parser.parse_list(records)
+        assert logs[0].timestamp == logs[2].timestamp != ""
+        assert logs[1].timestamp == "2025-01-01T00:00:00+00:00"
+        # Outside a parse batch, each log gets its own clock read again.
+        assert BehaviorLog(log_id="l4", agent_id="a1", action="read").timestamp
+
     def test_parse_list_context_preserved(self) -> None:
         parser = LogParser()
         records = [{"log_id": "l1", "agent_id": "a1", "action": "read", "context": {"role": "admin"}}]
@@ -287,6 +592,39 @@ class TestPolicyExtractor:
         result = extractor.extract(logs)
         assert len(result.policies) > 0
 
+    def test_extracted_policies_pass_validation(self) -> None:
+        result = PolicyExtractor(min_support=0.01, min_confidence=0.1).extract(
+            make_logs_with_pattern(20)
+        )
+        for policy in result.policies:
+            assert MinedPolicy.model_validate(policy.model_dump()) == policy
+
+    @pytest.mark.parametrize("total", [7, 10, 49, 100])
+    def test_support_threshold_is_inclusive(self, total: int) -> None:
+        logs = [
+            make_log(log_id=f"l{i}", action="read", context={"role": "admin"})
+            for i in range(3)
+        ] + [
+            make_log(log_id=f"m{i}", action="write", context={"role": "u"})
+            for i in range(total - 3)
+        ]
+        extractor = PolicyExtractor(min_support=3 / total, min_confidence=0.0)
+        antecedents = [p.antecedent for p in extractor.extract(logs).policies]
+        assert {"role": "admin"} in antecedents
+
+        extractor = PolicyExtractor(min_support=3 / total + 1e-9, min_confidence=0.0)
+        antecedents = [p.antecedent for p in extractor.extract(logs).policies]
+        assert {"role": "admin"} not in antecedents
+
+    @pytest.mark.parametrize("algorithm", ["single", "fpgrowth", "apriori"])
+    @pytest.mark.parametrize("min_support", [1e30, float("inf"), float("nan")])
+    def test_unreachable_support_yields_no_policies(
+        self, algorithm: Algorithm, min_support: float
+    ) -> None:
+        extractor = PolicyExtractor(min_support=min_support, algorithm=algorithm)
+        result = extractor.extract(make_logs_with_pattern(10))
+        assert result.policies == []
+
     def test_extract_source_logs_count(self) -> None:
         logs = make_logs_with_pattern(10)
         extractor = PolicyExtractor(min_support=0.05, min_confidence=0.5)
@@ -335,6 +673,30 @@ class TestPolicyExtractor:
         for policy in result.policies:
             assert policy.confidence >= 0.9
 
+    @pytest.mark.parametrize("algorithm", ["single", "fpgrowth", "apriori"])
+    def test_extract_numbers_policy_ids_in_emission_order(
+        self, algorithm: Algorithm
+    ) -> None:
+        # Rules are emitted grouped by antecedent (first seen first), so both
+        # slot=a rules are numbered before slot=b even though b->y is seen
+        # before a->z.  The final list is then sorted by confidence.
+        seen = [("a", "x"), ("b", "y"), ("a", "z")] * 4
+        logs = [
+            make_log(log_id=f"l{i}", action=action, context={"slot": slot})
+            for i, (slot, action) in enumerate(seen)
+        ]
+        extractor = PolicyExtractor(
+            min_support=0.01, min_confidence=0.4, algorithm=algorithm
+        )
+        result = extractor.extract(logs)
+        assert [
+            (p.policy_id, p.antecedent["slot"], p.consequent) for p in result.policies
+        ] == [
+            ("policy_0003", "b", "y"),
+            ("policy_0001", "a", "x"),
+            ("policy_0002", "a", "z"),
+        ]
+
     def test_extract_policy_has_required_fields(self) -> None:
         logs = make_logs_with_pattern(10)
         extractor = PolicyExtractor(min_support=0.05, min_confidence=0.5)
@@ -393,6 +755,153 @@ class TestPolicyExtractor:
             antecedent_keys.update(policy.antecedent.keys())
         assert "role" in antecedent_keys or "env" in antecedent_keys
 
+    @pytest.mark.parametrize("min_support", [0.01, 0.3, 0.9])
+    def test_vectorized_matches_python_backend(self, min_support: float) -> None:
+        pytest.importorskip("numpy")
+        logs: list[BehaviorLog] = []
+        roles = ["admin", "editor", "viewer"]
+        actions = ["read", "write", "delete", "read"]
+        for i in range(60):
+            logs.append(BehaviorLog(
+                log_id=f"l{i}",
+                agent_id="a1",
+                action=actions[i % len(actions)],
+                context={"role": roles[i % len(roles)], "env": "prod", "n": i % 2},
+                outcome="success",
+            ))
+        extractor = PolicyExtractor(
+            min_support=min_support, min_confidence=0.1, min_lift=0.0
+        )
+        records = [(log.action, list(log.context.items())) for log in logs]
+        assert extractor._mine_vectorized(records, len(logs)) == extractor._mine_python(
+            records, len(logs)
+        )
+
+    @pytest.mark.parametrize("algorithm", ["single", "fpgrowth", "apriori"])
+    def test_lift_of_exactly_one_passes_default_min_lift(
+        self, algorithm: Algorithm
+    ) -> None:
+        # confidence == P(write) == 3/11, so lift is exactly 1.0; multiplying
+        # by a rounded 11/3 instead gives 0.9999999999999999.
+        logs = [
+            make_log(
+                log_id=f"l{i}", action="write" if i < 3 else "read",
+                context={"env": "prod"},
+            )
+            for i in range(11)
+        ]
+        extractor = PolicyExtractor(
+            min_support=0.01, min_confidence=0.0, algorithm=algorithm
+        )
+        rules = {p.consequent: p.lift for p in extractor.extract(logs).policies}
+        assert rules == {"write": 1.0, "read": 1.0}
+
+    def test_lift_boundary_matches_across_backends(self) -> None:
+        pytest.importorskip("numpy")
+        extractor = PolicyExtractor(min_support=0.01, min_confidence=0.0)
+        records = [("write" if i < 3 else "read", [("env", "prod")]) for i in range(11)]
+        python = extractor._mine_python(records, 11)
+        assert [p.consequent for p in python] == ["write", "read"]
+        assert extractor._mine_vectorized(records, 11) == python
+
+    @pytest.mark.parametrize("distinct", [False, True])
+    def test_single_picks_backend_by_value_cardinality(
+        self, monkeypatch: pytest.MonkeyPatch, distinct: bool
+    ) -> None:
+        pytest.importorskip("numpy")
+        calls: list[str] = []
+
+        def spy(backend: str) -> object:
+            original = getattr(PolicyExtractor, backend)
+
+            def wrapper(self: PolicyExtractor, *args: object) -> object:
+                calls.append(backend)
+                return original(self, *args)
+
+            return wrapper
+
+        for backend in ("_mine_python", "_mine_vectorized"):
+            monkeypatch.setattr(PolicyExtractor, backend, spy(backend))
+        logs = [
+            make_log(log_id=f"l{i}", action="read",
+                     context={"id": str(i if distinct else i % 3)})
+            for i in range(100)
+        ]
+        PolicyExtractor(min_support=0.01).extract(logs)
+        assert calls == ["_mine_vectorized" if distinct else "_mine_python"]
+
+    @pytest.mark.parametrize("card", [3, 10_000])
+    def test_extract_columnar_survives_backend_probe(self, card: int) -> None:
+        # The probe must not exhaust extract_columnar's single-use zips.
+        table = LogTable(
+            actions=[f"act{i % 2}" for i in range(50)],
+            context_keys=[["k"] for _ in range(50)],
+            context_vals=[[str(i % card)] for i in range(50)],
+        )
+        extractor = PolicyExtractor(min_support=0.01, min_confidence=0.0)
+        logs = [
+            make_log(log_id=f"l{i}", action=action, context={"k": vals[0]})
+            for i, (action, vals) in enumerate(zip(table.actions, table.context_vals))
+        ]
+        assert extractor.extract_columnar(table).policies == extractor.extract(
+            logs
+        ).policies
+
+    def test_extract_keeps_int_and_bool_values_distinct(self) -> None:
+        logs = [
+            BehaviorLog(log_id=f"l{i}", agent_id="a1", action="read",
+                        context={"flag": value})
+            for i, value in enumerate([1, True, 1, True, 1.0, "1"])
+        ]
+        result = PolicyExtractor(min_support=0.01, min_confidence=0.5).extract(logs)
+        values = sorted(p.antecedent["flag"] for p in result.policies)
+        assert values == ["1", "1.0", "True"]
+
+    def test_extract_pairs_matches_extract(self) -> None:
+        logs = make_logs_with_pattern(10)
+        extractor = PolicyExtractor(min_support=0.05, min_confidence=0.5)
+        from_logs = extractor.extract(logs)
+        from_pairs = extractor.extract_pairs([(log.action, log.context) for log in logs])
+        assert from_pairs.source_logs == from_logs.source_logs
+        assert from_pairs.policies == from_logs.policies
+
+    @pytest.mark.parametrize("algorithm", ["fpgrowth", "apriori"])
+    def test_extract_multi_key_antecedents(self, algorithm: Algorithm) -> None:
+        logs: list[BehaviorLog] = []
+        for i in range(20):
+            prod = i % 2 == 0
+            admin = i % 4 < 2
+            action = "delete" if (prod and admin) else "read"
+            logs.append(BehaviorLog(
+                log_id=f"l{i}", agent_id="a1", action=action,
+                context={"role": "admin" if admin else "viewer",
+                         "env": "prod" if prod else "dev"},
+            ))
+        extractor = PolicyExtractor(
+            min_support=0.1, min_confidence=0.9, algorithm=algorithm
+        )
+        result = extractor.extract(logs)
+        rule = next(p for p in result.policies if p.consequent == "delete")
+        assert rule.antecedent == {"env": "prod", "role": "admin"}
+        assert rule.confidence == 1.0
+        assert rule.lift == 4.0
+        assert "env='prod' and role='admin'" in rule.description
+
+    def test_itemset_single_pair_rules_match_single(self) -> None:
+        logs = make_logs_with_pattern(10)
+        single = PolicyExtractor(min_support=0.05, min_confidence=0.5).extract(logs)
+        multi = PolicyExtractor(
+            min_support=0.05, min_confidence=0.5, algorithm="fpgrowth",
+            max_antecedent_size=1,
+        ).extract(logs)
+        assert multi.policies == single.policies
+
+    def test_extractor_rejects_unknown_algorithm(self) -> None:
+        with pytest.raises(ValueError):
+            PolicyExtractor(algorithm="eclat")  # type: ignore[arg-type]
+        with pytest.raises(ValueError):
+            PolicyExtractor(max_antecedent_size=0)
+
     def test_extractor_default_thresholds(self) -> None:
         extractor = PolicyExtractor()
         assert extractor.min_support == 0.05
@@ -503,6 +1012,41 @@ class TestPolicyFormatter:
         loaded = PolicySet.model_validate(data)
         assert loaded.name == "Load Test"
 
+    def test_to_json_file_matches_model_dump_json(self, tmp_path: Path) -> None:
+        formatter = PolicyFormatter()
+        ps = PolicySet(name="Caf\u00e9", source_logs=5, policies=[make_policy()])
+        output_path = tmp_path / "policies.json"
+        formatter.to_json_file(ps, output_path)
+        assert output_path.read_text(encoding="utf-8") == ps.model_dump_json(indent=2)
+
+    def test_to_json_file_round_trips_awkward_floats(self, tmp_path: Path) -> None:
+        formatter = PolicyFormatter()
+        floats = {"big": 1e20, "tiny": 1e-7, "denormal": 5e-324, "sum": 0.1 + 0.2}
+        policy = make_policy(antecedent=floats)
+        ps = PolicySet(name="Floats", source_logs=5, policies=[policy])
+        output_path = tmp_path / "policies.json"
+        formatter.to_json_file(ps, output_path)
+        assert PolicySet.model_validate_json(output_path.read_bytes()) == ps
+        assert json.loads(output_path.read_bytes()) == json.loads(ps.model_dump_json())
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_to_json_file_writes_big_ints(self, tmp_path: Path, compact: bool) -> None:
+        formatter = PolicyFormatter()
+        policy = make_policy(antecedent={"quota": 2**70})
+        ps = PolicySet(name="Big", source_logs=5, policies=[policy])
+        output_path = tmp_path / "policies.json"
+        formatter.to_json_file(ps, output_path, compact=compact)
+        data = json.loads(output_path.read_text(encoding="utf-8"))
+        assert data["policies"][0]["antecedent"] == {"quota": 2**70}
+
+    def test_to_json_file_compact(self, tmp_path: Path) -> None:
+        formatter = PolicyFormatter()
+        ps = PolicySet(name="Compact", source_logs=5, policies=[make_policy()])
+        output_path = tmp_path / "policies.json"
+        formatter.to_json_file(ps, output_path, compact=True)
+        assert output_path.read_text(encoding="utf-8") == ps.model_dump_json()
+        assert PolicySet.model_validate_json(output_path.read_bytes()) == ps
+
     def test_to_text_empty_policies(self) -> None:
         formatter = PolicyFormatter()
         ps = PolicySet(name="Empty", source_logs=0, policies=[])
@@ -0,0 +1,70 @@
+"""Tests for aumai_policyminer.itemsets (FP-Growth and Apriori)."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from itertools import combinations
+
+import pytest
+
+from aumai_policyminer.itemsets import Itemset, apriori, fpgrowth
+
+Miner = Callable[..., dict[Itemset, int]]
+
+
+def brute_force(
+    transactions: list[list[int]],
+    min_count: int,
+    max_len: int,
+    anchors: set[int] | None = None,
+) -> dict[Itemset, int]:
+    counts: dict[Itemset, int] = {}
+    for transaction in transactions:
+        items = sorted(transaction)
+        for size in range(1, max_len + 1):
+            for combo in combinations(items, size):
+                if size == max_len and anchors is not None and anchors.isdisjoint(combo):
+                    continue
+                counts[combo] = counts.get(combo, 0) + 1
+    return {s: c for s, c in sorted(counts.items()) if c >= min_count}
+
+
+def random_transactions(seed: int, count: int = 200) -> list[list[int]]:
+    rng = random.Random(seed)
+    return [rng.sample(range(12), rng.randint(1, 5)) for _ in range(count)]
+
+
+class TestFrequentItemsets:
+    def test_fpgrowth_small_example(self) -> None:
+        result = fpgrowth([[0, 1], [0, 1], [0, 2]], min_count=2, max_len=2)
+        assert result == {(0,): 3, (0, 1): 2, (1,): 2}
+
+    @pytest.mark.parametrize("mine", [fpgrowth, apriori])
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_brute_force(self, mine: Miner, seed: int) -> None:
+        transactions = random_transactions(seed)
+        for min_count, max_len in [(1, 2), (10, 3), (25, 4)]:
+            assert mine(transactions, min_count, max_len) == brute_force(
+                transactions, min_count, max_len
+            )
+
+    @pytest.mark.parametrize("mine", [fpgrowth, apriori])
+    def test_max_len_zero_returns_nothing(self, mine: Miner) -> None:
+        assert mine([[0, 1]], 1, 0) == {}
+
+    @pytest.mark.parametrize("mine", [fpgrowth, apriori])
+    def test_empty_transactions(self, mine: Miner) -> None:
+        assert mine([], 1, 3) == {}
+
+    @pytest.mark.parametrize("mine", [fpgrowth, apriori])
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    @pytest.mark.parametrize("anchors", [{0}, {3, 7, 11}, set(range(12))])
+    def test_anchors_cap_unanchored_itemsets(
+        self, mine: Miner, seed: int, anchors: set[int]
+    ) -> None:
+        transactions = random_transactions(seed)
+        for min_count, max_len in [(1, 1), (1, 2), (10, 3), (25, 4)]:
+            assert mine(transactions, min_count, max_len, anchors=anchors) == (
+                brute_force(transactions, min_count, max_len, anchors)
+            )